@@ -7,7 +7,6 @@ Perfect for client presentation and project demonstration
 import os
 import sys
 import time
-from pathlib import Path
 
 def print_header():
     """Print professional header"""
@@ -29,17 +28,32 @@ def check_system_requirements():
     """Check if all system requirements are met"""
     print_section("SYSTEM REQUIREMENTS CHECK")
     
+    with os.scandir(".") as it:
+        entries = {entry.name: entry for entry in it}
+    
+    # Names missing from the listing are re-checked through os.path, which
+    # handles case-insensitive filesystems.
+    def has_file(name):
+        if name in entries:
+            return entries[name].is_file()
+        return os.path.isfile(name)
+    
+    def has_dir(name):
+        if name in entries:
+            return entries[name].is_dir()
+        return os.path.isdir(name)
+    
     requirements = [
         ("Python 3.x", sys.version_info.major >= 3),
-        ("verification_tool.py", os.path.exists("verification_tool.py")),
-        ("verification_config.json", os.path.exists("verification_config.json")),
-        ("requirements.txt", os.path.exists("requirements.txt")),
-        ("main.py", os.path.exists("main.py")),
-        ("config.json", os.path.exists("config.json")),
-        ("phase2.db", os.path.exists("phase2.db")),
-        ("src/ directory", os.path.exists("src/")),
-        ("tests/ directory", os.path.exists("tests/")),
-        ("data/ directory", os.path.exists("data/")),
+        ("verification_tool.py", has_file("verification_tool.py")),
+        ("verification_config.json", has_file("verification_config.json")),
+        ("requirements.txt", has_file("requirements.txt")),
+        ("main.py", has_file("main.py")),
+        ("config.json", has_file("config.json")),
+        ("phase2.db", has_file("phase2.db")),
+        ("src/ directory", has_dir("src")),
+        ("tests/ directory", has_dir("tests")),
+        ("data/ directory", has_dir("data")),
     ]
     
     all_good = True
@@ -82,18 +96,22 @@ def show_evidence_files():
     """Show evidence files generated"""
     print_section("EVIDENCE FILES GENERATED")
     
-    evidence_dir = Path("verification_evidence")
-    if evidence_dir.exists():
-        files = list(evidence_dir.glob("*"))
-        if files:
-            print(f"Found {len(files)} evidence files:")
-            for file in sorted(files):
-                size = file.stat().st_size
-                print(f"  {file.name:<40} ({size} bytes)")
-        else:
-            print("No evidence files found")
-    else:
+    try:
+        with os.scandir("verification_evidence") as it:
+            files = sorted(it, key=lambda entry: entry.name)
+    except FileNotFoundError:
         print("Evidence directory not found")
+        return
+    except NotADirectoryError:
+        files = []
+    
+    if files:
+        print(f"Found {len(files)} evidence files:")
+        for file in files:
+            size = file.stat().st_size
+            print(f"  {file.name:<40} ({size} bytes)")
+    else:
+        print("No evidence files found")
 
 def show_telegram_integration():
     """Show Telegram integration status"""
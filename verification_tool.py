@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 
+import io
 import os
+import sys
+import copy
 import json
+import time
 import logging
 from datetime import datetime
 from pathlib import Path
-import requests
-from typing import Dict, List, Any
-import argparse
+from typing import TYPE_CHECKING, Dict, List, Any
 
 try:
     from dotenv import load_dotenv
@@ -15,37 +17,89 @@ try:
 except ImportError:
     pass
 
-try:
+if TYPE_CHECKING:
     from telegram import Update
-    from telegram.ext import Application, MessageHandler, filters, ContextTypes
-    TELEGRAM_AVAILABLE = True
+    from telegram.ext import ContextTypes
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    TELEGRAM_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+_CONFIG_CACHE: Dict[str, tuple] = {}
+
+EVIDENCE_COMPACT = os.getenv('EVIDENCE_COMPACT', '1') == '1'
+
+EVIDENCE_HEADERS = ("Content-Type", "Content-Length", "Server", "Date")
+
+_LOGGING_CONFIGURED = False
+
+def _configure_logging(evidence_dir: Path):
+    global _LOGGING_CONFIGURED
+    if _LOGGING_CONFIGURED:
+        return
+    _LOGGING_CONFIGURED = True
+    
+    import logging.handlers
+    
+    log_format = '%(asctime)s - %(levelname)s - %(message)s'
+    file_handler = logging.FileHandler(evidence_dir / "verification.log", encoding='utf-8', delay=True)
+    file_handler.setFormatter(logging.Formatter(log_format))
+    log_buffer = logging.handlers.MemoryHandler(
+        capacity=64, flushLevel=logging.ERROR, target=file_handler
+    )
+    stream_handler = logging.StreamHandler()
+    stream_handler.setLevel(logging.INFO if sys.stderr.isatty() else logging.WARNING)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format=log_format,
+        handlers=[log_buffer, stream_handler]
+    )
+
+def _flush_logs():
+    for handler in logging.getLogger().handlers:
+        handler.flush()
 
 class VerificationResult:
-    def __init__(self, component: str, status: str, details: str, evidence_file: str = None):
+    __slots__ = ('component', 'status', 'details', 'evidence_file', '_t', '_timestamp')
+
+    def __init__(self, component: str, status: str, details: str, evidence_file: str = None,
+                 timestamp: str = None):
         self.component = component
         self.status = status
         self.details = details
         self.evidence_file = evidence_file
-        self.timestamp = datetime.now().isoformat()
+        self._t = time.time() if timestamp is None else None
+        self._timestamp = timestamp
+
+    @property
+    def timestamp(self) -> str:
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._t).isoformat()
+        return self._timestamp
 
 class VerificationTool:
     def __init__(self, config_file: str = "verification_config.json"):
         self.config = self.load_config(config_file)
         self.results = []
+        self._results_version = 0
+        self._cached_report_version = None
+        self._cached_report = None
         self.evidence_dir = Path("verification_evidence")
         self.evidence_dir.mkdir(exist_ok=True)
+        self._evidence_dir_str = str(self.evidence_dir) + os.sep
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(self.evidence_dir / "verification.log", encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        _configure_logging(self.evidence_dir)
         self.logger = logging.getLogger(__name__)
+        self._session = None
+        self._request_exception = None
+        self._endpoint_urls = None
+        self._file_structure_skel = None
+        self._database_schema_skel = None
+        self._required_tables_set = None
+        self._api_endpoints_skel = None
 
     def load_config(self, config_file: str) -> Dict[str, Any]:
         telegram_token = os.getenv('TELEGRAM_BOT_TOKEN', 'YOUR_BOT_TOKEN_HERE')
@@ -71,55 +125,152 @@ class VerificationTool:
             }
         }
         
-        if os.path.exists(config_file):
-            with open(config_file, 'r') as f:
-                return json.load(f)
-        else:
+        try:
+            st = os.stat(config_file)
+        except FileNotFoundError:
             with open(config_file, 'w') as f:
                 json.dump(default_config, f, indent=2)
             print(f"Created default config file: {config_file}")
             return default_config
+        
+        cached = _CONFIG_CACHE.get(config_file)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            data = cached[2]
+        else:
+            with open(config_file, 'rb') as f:
+                data = json.loads(f.read())
+            _CONFIG_CACHE[config_file] = (st.st_mtime_ns, st.st_size, data)
+        return copy.deepcopy(data)
+
+    # Evidence skeletons are built on first use so that config errors surface
+    # inside the check that needs them. Keys are laid out in evidence order;
+    # None marks per-run values.
+    def _file_structure_skeleton(self) -> Dict[str, Any]:
+        if self._file_structure_skel is None:
+            files_config = self.config["phase2_outputs"]["file_structure"]
+            self._file_structure_skel = {
+                "timestamp": None,
+                "check_type": "file_structure",
+                "checked_files": list(files_config["required_files"]),
+                "checked_dirs": list(files_config["required_dirs"]),
+                "existing_files": None,
+                "existing_dirs": None,
+                "missing_files": None,
+                "missing_dirs": None,
+                "current_directory_contents": None,
+                "total_files_checked": len(files_config["required_files"]),
+                "total_dirs_checked": len(files_config["required_dirs"]),
+                "files_found": None,
+                "dirs_found": None
+            }
+        return self._file_structure_skel
+
+    def _database_schema_skeleton(self) -> Dict[str, Any]:
+        if self._database_schema_skel is None:
+            database_config = self.config["phase2_outputs"]["database_schema"]
+            self._required_tables_set = frozenset(database_config["required_tables"])
+            self._database_schema_skel = {
+                "timestamp": None,
+                "check_type": "database_schema",
+                "database_file": database_config["connection_string"].replace("sqlite:///", ""),
+                "database_size_bytes": None,
+                "required_tables": list(database_config["required_tables"]),
+                "existing_tables": None,
+                "missing_tables": None,
+                "total_tables_required": len(database_config["required_tables"]),
+                "total_tables_found": None
+            }
+        return self._database_schema_skel
+
+    def _api_endpoints_skeleton(self) -> Dict[str, Any]:
+        if self._api_endpoints_skel is None:
+            api_config = self.config["phase2_outputs"]["api_endpoints"]
+            self._api_endpoints_skel = {
+                "timestamp": None,
+                "check_type": "api_endpoints",
+                "base_url": api_config["base_url"],
+                "tested_endpoints": list(api_config["endpoints"]),
+                "results": None,
+                "successful_endpoints": None,
+                "failed_endpoints": None,
+                "total_endpoints_tested": len(api_config["endpoints"]),
+                "successful_count": None,
+                "failed_count": None
+            }
+        return self._api_endpoints_skel
+
+    def _write_evidence(self, evidence_file: str, evidence: Dict[str, Any]):
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(evidence, option=0 if EVIDENCE_COMPACT else orjson.OPT_INDENT_2)
+        elif EVIDENCE_COMPACT:
+            data = json.dumps(evidence, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        else:
+            data = json.dumps(evidence, indent=2, ensure_ascii=False).encode('utf-8')
+        
+        with open(evidence_file, 'wb') as f:
+            f.write(data)
 
-    def check_file_structure(self) -> VerificationResult:
+    def check_file_structure(self, now: datetime = None) -> VerificationResult:
         self.logger.info("Checking file structure...")
         
+        if now is None:
+            now = datetime.now()
+        iso = now.isoformat()
+        stamp = f"{now:%Y%m%d_%H%M%S}"
+        
         config = self.config["phase2_outputs"]["file_structure"]
         missing_files = []
         missing_dirs = []
         existing_files = []
         existing_dirs = []
         
+        with os.scandir(".") as it:
+            entries = {entry.name: entry for entry in it}
+        
+        # Names missing from the listing are re-checked through os.path, which
+        # handles nested paths and case-insensitive filesystems.
+        path_separators = "/" + os.sep + (os.altsep or "")
+        get_entry = entries.get
+        isfile = os.path.isfile
+        isdir = os.path.isdir
+        existing_files_append = existing_files.append
+        missing_files_append = missing_files.append
+        existing_dirs_append = existing_dirs.append
+        missing_dirs_append = missing_dirs.append
+        
         for file_path in config["required_files"]:
-            if os.path.exists(file_path):
-                existing_files.append(file_path)
+            entry = get_entry(file_path)
+            if entry is not None and entry.is_file():
+                existing_files_append(file_path)
+            elif entry is None and isfile(file_path):
+                existing_files_append(file_path)
             else:
-                missing_files.append(file_path)
+                missing_files_append(file_path)
         
         for dir_path in config["required_dirs"]:
-            if os.path.exists(dir_path):
-                existing_dirs.append(dir_path)
+            name = dir_path.rstrip(path_separators)
+            entry = get_entry(name)
+            if entry is not None and entry.is_dir():
+                existing_dirs_append(dir_path)
+            elif entry is None and isdir(name or dir_path):
+                existing_dirs_append(dir_path)
             else:
-                missing_dirs.append(dir_path)
+                missing_dirs_append(dir_path)
         
-        evidence = {
-            "timestamp": datetime.now().isoformat(),
-            "check_type": "file_structure",
-            "checked_files": config["required_files"],
-            "checked_dirs": config["required_dirs"],
+        evidence = self._file_structure_skeleton().copy()
+        evidence.update({
+            "timestamp": iso,
             "existing_files": existing_files,
             "existing_dirs": existing_dirs,
             "missing_files": missing_files,
             "missing_dirs": missing_dirs,
-            "current_directory_contents": os.listdir("."),
-            "total_files_checked": len(config["required_files"]),
-            "total_dirs_checked": len(config["required_dirs"]),
+            "current_directory_contents": list(entries),
             "files_found": len(existing_files),
             "dirs_found": len(existing_dirs)
-        }
+        })
         
-        evidence_file = self.evidence_dir / f"file_structure_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(evidence_file, 'w') as f:
-            json.dump(evidence, f, indent=2)
+        evidence_file = self._evidence_dir_str + f"file_structure_{stamp}.json"
+        self._write_evidence(evidence_file, evidence)
         
         if missing_files or missing_dirs:
             status = "FAIL"
@@ -128,54 +279,67 @@ class VerificationTool:
             status = "PASS"
             details = f"All {len(existing_files)} files and {len(existing_dirs)} directories found"
         
-        return VerificationResult("File Structure", status, details, str(evidence_file))
+        return VerificationResult("File Structure", status, details, evidence_file, iso)
 
-    def check_database_schema(self) -> VerificationResult:
+    def check_database_schema(self, now: datetime = None) -> VerificationResult:
         self.logger.info("Checking database schema...")
         
+        if now is None:
+            now = datetime.now()
+        iso = now.isoformat()
+        stamp = f"{now:%Y%m%d_%H%M%S}"
+        
         try:
             import sqlite3
             config = self.config["phase2_outputs"]["database_schema"]
             
-            db_file = config["connection_string"].replace("sqlite:///", "")
+            skeleton = self._database_schema_skeleton()
+            db_file = skeleton["database_file"]
             
             if not os.path.exists(db_file):
-                return VerificationResult("Database Schema", "FAIL", f"Database file {db_file} not found", None)
-            
-            conn = sqlite3.connect(db_file)
-            cursor = conn.cursor()
+                return VerificationResult("Database Schema", "FAIL", f"Database file {db_file} not found", None, iso)
             
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            existing_tables = [row[0] for row in cursor.fetchall()]
-            
-            table_schemas = {}
-            for table in existing_tables:
-                cursor.execute(f"PRAGMA table_info({table});")
-                table_schemas[table] = cursor.fetchall()
+            collect_details = self.config.get("collect_schema_details", False)
+            conn = sqlite3.connect(db_file, isolation_level=None)
+            try:
+                cursor = conn.cursor()
+                cursor.execute("PRAGMA query_only=1;")
+                
+                if collect_details:
+                    cursor.execute(
+                        "SELECT m.name, p.cid, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+                        "FROM sqlite_master AS m LEFT JOIN pragma_table_info(m.name) AS p "
+                        "WHERE m.type='table' ORDER BY m.rowid, p.cid;"
+                    )
+                    table_schemas = {}
+                    setdefault = table_schemas.setdefault
+                    for table, *column in cursor.fetchall():
+                        columns = setdefault(table, [])
+                        if column[0] is not None:
+                            columns.append(column)
+                    existing_tables = list(table_schemas)
+                else:
+                    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY rowid;")
+                    existing_tables = [row[0] for row in cursor.fetchall()]
+            finally:
+                conn.close()
             
-            missing_tables = []
-            for required_table in config["required_tables"]:
-                if required_table not in existing_tables:
-                    missing_tables.append(required_table)
+            missing_set = self._required_tables_set.difference(existing_tables)
+            missing_tables = [table for table in config["required_tables"] if table in missing_set]
             
-            evidence = {
-                "timestamp": datetime.now().isoformat(),
-                "check_type": "database_schema",
-                "database_file": db_file,
+            evidence = skeleton.copy()
+            evidence.update({
+                "timestamp": iso,
                 "database_size_bytes": os.path.getsize(db_file),
-                "required_tables": config["required_tables"],
                 "existing_tables": existing_tables,
                 "missing_tables": missing_tables,
-                "table_schemas": table_schemas,
-                "total_tables_required": len(config["required_tables"]),
                 "total_tables_found": len(existing_tables)
-            }
+            })
+            if collect_details:
+                evidence["table_schemas"] = table_schemas
             
-            evidence_file = self.evidence_dir / f"database_schema_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(evidence_file, 'w') as f:
-                json.dump(evidence, f, indent=2)
-            
-            conn.close()
+            evidence_file = self._evidence_dir_str + f"database_schema_{stamp}.json"
+            self._write_evidence(evidence_file, evidence)
             
             if missing_tables:
                 status = "FAIL"
@@ -184,72 +348,105 @@ class VerificationTool:
                 status = "PASS"
                 details = f"All {len(existing_tables)} required tables found"
                 
-            return VerificationResult("Database Schema", status, details, str(evidence_file))
+            return VerificationResult("Database Schema", status, details, evidence_file, iso)
             
         except Exception as e:
             error_evidence = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": iso,
                 "check_type": "database_schema",
                 "error": str(e),
                 "error_type": type(e).__name__
             }
-            evidence_file = self.evidence_dir / f"database_error_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(evidence_file, 'w') as f:
-                json.dump(error_evidence, f, indent=2)
-            return VerificationResult("Database Schema", "FAIL", f"Error checking database: {str(e)}", str(evidence_file))
+            evidence_file = self._evidence_dir_str + f"database_error_{stamp}.json"
+            self._write_evidence(evidence_file, error_evidence)
+            return VerificationResult("Database Schema", "FAIL", f"Error checking database: {str(e)}", evidence_file, iso)
+
+    def _get_endpoint_urls(self) -> List[tuple]:
+        if self._endpoint_urls is None:
+            api_config = self.config["phase2_outputs"]["api_endpoints"]
+            base_url = api_config["base_url"]
+            self._endpoint_urls = [(endpoint, base_url + endpoint) for endpoint in api_config["endpoints"]]
+        return self._endpoint_urls
+
+    def _get_session(self):
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, len(self._get_endpoint_urls())), max_retries=0)
+            self._request_exception = requests.exceptions.RequestException
+            self._session = requests.Session()
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
 
-    def check_api_endpoints(self) -> VerificationResult:
+    def _probe_endpoint(self, session, request_exception, url: str) -> Dict[str, Any]:
+        try:
+            response = session.get(url, timeout=10)
+            return {
+                "status_code": response.status_code,
+                "response_time": response.elapsed.total_seconds(),
+                "accessible": response.status_code < 500,
+                "content_length": len(response.content),
+                "headers": {
+                    name: response.headers[name]
+                    for name in EVIDENCE_HEADERS if name in response.headers
+                }
+            }
+        except request_exception as e:
+            return {
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "accessible": False
+            }
+
+    def check_api_endpoints(self, now: datetime = None) -> VerificationResult:
         self.logger.info("Checking API endpoints...")
         
-        config = self.config["phase2_outputs"]["api_endpoints"]
-        base_url = config["base_url"]
-        endpoints = config["endpoints"]
+        if now is None:
+            now = datetime.now()
+        iso = now.isoformat()
+        stamp = f"{now:%Y%m%d_%H%M%S}"
+        
+        endpoint_urls = self._get_endpoint_urls()
         
         results = {}
         failed_endpoints = []
         successful_endpoints = []
         
-        for endpoint in endpoints:
-            url = f"{base_url}{endpoint}"
-            try:
-                response = requests.get(url, timeout=10)
-                results[endpoint] = {
-                    "status_code": response.status_code,
-                    "response_time": response.elapsed.total_seconds(),
-                    "accessible": response.status_code < 500,
-                    "content_length": len(response.content),
-                    "headers": dict(response.headers)
-                }
-                
-                if response.status_code < 500:
-                    successful_endpoints.append(endpoint)
-                else:
-                    failed_endpoints.append(endpoint)
-                    
-            except requests.exceptions.RequestException as e:
-                results[endpoint] = {
-                    "error": str(e),
-                    "error_type": type(e).__name__,
-                    "accessible": False
+        session = self._get_session()
+        request_exception = self._request_exception
+        probed = {}
+        if endpoint_urls:
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+            
+            with ThreadPoolExecutor(max_workers=min(8, len(endpoint_urls))) as executor:
+                futures = {
+                    executor.submit(self._probe_endpoint, session, request_exception, url): endpoint
+                    for endpoint, url in endpoint_urls
                 }
+                for future in as_completed(futures):
+                    probed[futures[future]] = future.result()
+        
+        for endpoint, _ in endpoint_urls:
+            results[endpoint] = probed[endpoint]
+            if results[endpoint]["accessible"]:
+                successful_endpoints.append(endpoint)
+            else:
                 failed_endpoints.append(endpoint)
         
-        evidence = {
-            "timestamp": datetime.now().isoformat(),
-            "check_type": "api_endpoints",
-            "base_url": base_url,
-            "tested_endpoints": endpoints,
+        evidence = self._api_endpoints_skeleton().copy()
+        evidence.update({
+            "timestamp": iso,
             "results": results,
             "successful_endpoints": successful_endpoints,
             "failed_endpoints": failed_endpoints,
-            "total_endpoints_tested": len(endpoints),
             "successful_count": len(successful_endpoints),
             "failed_count": len(failed_endpoints)
-        }
+        })
         
-        evidence_file = self.evidence_dir / f"api_endpoints_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(evidence_file, 'w') as f:
-            json.dump(evidence, f, indent=2)
+        evidence_file = self._evidence_dir_str + f"api_endpoints_{stamp}.json"
+        self._write_evidence(evidence_file, evidence)
         
         if failed_endpoints:
             status = "FAIL"
@@ -258,26 +455,34 @@ class VerificationTool:
             status = "PASS"
             details = f"All {len(successful_endpoints)} endpoints accessible"
         
-        return VerificationResult("API Endpoints", status, details, str(evidence_file))
+        return VerificationResult("API Endpoints", status, details, evidence_file, iso)
 
     def run_verification(self, phase: str = "phase2") -> List[VerificationResult]:
         self.logger.info(f"Starting verification for {phase}")
         self.results = []
+        now = datetime.now()
         
-        self.results.append(self.check_file_structure())
-        self.results.append(self.check_database_schema())
-        self.results.append(self.check_api_endpoints())
+        self.results.append(self.check_file_structure(now))
+        self.results.append(self.check_database_schema(now))
+        self.results.append(self.check_api_endpoints(now))
         
+        self._results_version += 1
+        _flush_logs()
         return self.results
 
     def generate_report(self) -> str:
-        report = []
-        report.append("=" * 60)
-        report.append("VERIFICATION REPORT")
-        report.append("=" * 60)
-        report.append(f"Timestamp: {datetime.now().isoformat()}")
-        report.append(f"Project: {self.config.get('project_name', 'AI Project')}")
-        report.append("")
+        if self._cached_report_version == self._results_version:
+            return self._cached_report
+        
+        now = datetime.now()
+        rule = "=" * 60 + "\n"
+        report = io.StringIO()
+        report.write(rule)
+        report.write("VERIFICATION REPORT\n")
+        report.write(rule)
+        report.write(f"Timestamp: {now.isoformat()}\n")
+        report.write(f"Project: {self.config.get('project_name', 'AI Project')}\n")
+        report.write("\n")
         
         all_passed = True
         total_checks = len(self.results)
@@ -285,30 +490,33 @@ class VerificationTool:
         
         for result in self.results:
             status_icon = "PASS" if result.status == "PASS" else "FAIL"
-            report.append(f"{status_icon} {result.component}: {result.status}")
-            report.append(f"   Details: {result.details}")
+            report.write(f"{status_icon} {result.component}: {result.status}\n")
+            report.write(f"   Details: {result.details}\n")
             if result.evidence_file:
-                report.append(f"   Evidence: {result.evidence_file}")
-            report.append("")
+                report.write(f"   Evidence: {result.evidence_file}\n")
+            report.write("\n")
             
             if result.status == "PASS":
                 passed_checks += 1
             else:
                 all_passed = False
         
-        report.append("=" * 60)
-        report.append(f"SUMMARY: {passed_checks}/{total_checks} checks passed")
+        report.write(rule)
+        report.write(f"SUMMARY: {passed_checks}/{total_checks} checks passed\n")
         overall_status = "PASS" if all_passed else "FAIL"
-        report.append(f"OVERALL STATUS: {overall_status}")
-        report.append("=" * 60)
+        report.write(f"OVERALL STATUS: {overall_status}\n")
+        report.write("=" * 60)
         
-        report_file = self.evidence_dir / f"verification_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write("\n".join(report))
+        self._cached_report = report.getvalue()
+        self._cached_report_version = self._results_version
         
-        return "\n".join(report)
+        report_file = self._evidence_dir_str + f"verification_report_{now:%Y%m%d_%H%M%S}.txt"
+        with open(report_file, 'wb') as f:
+            f.write(self._cached_report.encode('utf-8'))
+        
+        return self._cached_report
 
-    async def handle_telegram_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def handle_telegram_command(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE"):
         message = update.message.text.lower()
         
         if "run phase 2 test" in message or "run verification" in message:
@@ -326,7 +534,9 @@ class VerificationTool:
             )
 
     def start_telegram_bot(self):
-        if not TELEGRAM_AVAILABLE:
+        try:
+            from telegram.ext import Application, MessageHandler, filters
+        except ImportError:
             print("Telegram library not available")
             return
             
@@ -342,6 +552,8 @@ class VerificationTool:
         application.run_polling()
 
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Verification Tool for AI Project")
     parser.add_argument("--mode", choices=["cli", "telegram"], default="cli", 
                       help="Run mode: cli for command line, telegram for bot")